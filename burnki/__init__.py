@@ -2,24 +2,45 @@
 
 from __future__ import annotations
 
+from functools import partial
+
 from aqt import gui_hooks, mw
 from aqt.operations import QueryOp
 from aqt.qt import QAction, QMenu
 from aqt.utils import showInfo, tooltip
 
-from .sync import SyncResult, apply_sync_result, fetch_sync_data
+from .sync import SyncResult, apply_sync_result, cleanup_sync_result, fetch_sync_data
+
+
+_config_cache: dict | None = None
+
+
+def _get_config() -> dict | None:
+    """Addon config, read from disk once and then kept in memory."""
+    global _config_cache
+    if _config_cache is None:
+        _config_cache = mw.addonManager.getConfig(__name__)
+    return _config_cache
+
+
+def _on_config_updated(config: dict) -> None:
+    # user edited the config through the add-ons dialog
+    global _config_cache
+    _config_cache = config
 
 
-def _get_token() -> str | None:
-    config = mw.addonManager.getConfig(__name__)
+def _get_token(config: dict | None = None) -> str | None:
+    if config is None:
+        config = _get_config()
     if config is None:
         return None
     token = config.get("wanikani_api_token", "")
     return token if token else None
 
 
-def _get_updated_after() -> str | None:
-    config = mw.addonManager.getConfig(__name__)
+def _get_updated_after(config: dict | None = None) -> str | None:
+    if config is None:
+        config = _get_config()
     if config is None:
         return None
     ts = config.get("last_sync_timestamp", "")
@@ -29,7 +50,10 @@ def _get_updated_after() -> str | None:
 def _save_timestamp() -> None:
     import datetime
 
-    config = mw.addonManager.getConfig(__name__) or {}
+    global _config_cache
+    config = _get_config()
+    if config is None:
+        config = _config_cache = {}
     config["last_sync_timestamp"] = (
         datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000000Z")
     )
@@ -37,6 +61,14 @@ def _save_timestamp() -> None:
 
 
 def _on_sync_done(result: SyncResult) -> None:
+    try:
+        _apply_result(result)
+    finally:
+        # downloaded audio must not outlive the sync, whatever happened
+        cleanup_sync_result(result)
+
+
+def _apply_result(result: SyncResult) -> None:
     if result.error:
         tooltip(f"Burnki sync error: {result.error}", period=5000)
         return
@@ -57,7 +89,8 @@ def _on_sync_done(result: SyncResult) -> None:
 
 def _run_sync(full: bool = False) -> None:
     """Kick off a sync. If full=True, re-fetch everything."""
-    token = _get_token()
+    config = _get_config() or {}
+    token = _get_token(config)
     if not token:
         showInfo(
             "Burnki: no WaniKani API token configured.\n\n"
@@ -66,16 +99,26 @@ def _run_sync(full: bool = False) -> None:
         )
         return
 
-    updated_after = None if full else _get_updated_after()
-    config = mw.addonManager.getConfig(__name__) or {}
+    updated_after = None if full else _get_updated_after(config)
     audio = config.get("download_audio", True)
 
+    # only the path here; listing the folder happens in the background
+    media_dir = mw.col.media.dir()
+
+    update = mw.progress.update
+
     def _update_progress(msg: str) -> None:
-        mw.taskman.run_on_main(lambda: mw.progress.update(label=msg))
+        mw.taskman.run_on_main(partial(update, label=msg))
 
     op = QueryOp(
         parent=mw,
-        op=lambda col: fetch_sync_data(token, updated_after, progress=_update_progress, download_audio=audio),
+        op=lambda col: fetch_sync_data(
+            token,
+            updated_after,
+            progress=_update_progress,
+            download_audio=audio,
+            media_dir=media_dir,
+        ),
         success=_on_sync_done,
     )
     label = "Full re-sync Burnki…" if full else "Syncing Burnki…"
@@ -100,9 +143,9 @@ def _setup_menu() -> None:
 # -- hooks --
 
 def _on_profile_did_open() -> None:
-    config = mw.addonManager.getConfig(__name__)
+    config = _get_config()
     if config and config.get("auto_sync_on_startup", True):
-        token = _get_token()
+        token = _get_token(config)
         if token:
             _run_sync()
         else:
@@ -114,3 +157,4 @@ def _on_profile_did_open() -> None:
 
 gui_hooks.profile_did_open.append(_on_profile_did_open)
 gui_hooks.main_window_did_init.append(_setup_menu)
+mw.addonManager.setConfigUpdatedAction(__name__, _on_config_updated)
@@ -3,6 +3,7 @@ the note type with all the fields, card templates, and styling."""
 
 from __future__ import annotations
 
+import hashlib
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -139,6 +140,15 @@ hr#answer {
 """
 
 
+# Stored on the note type so startup can skip rewriting the templates
+# and css when they haven't changed since the last update.
+TEMPLATE_HASH_KEY = "burnki_tpl_hash"
+TEMPLATE_HASH = hashlib.blake2b(
+    "\x1f".join([*FIELDS, FRONT_TEMPLATE, BACK_TEMPLATE, CSS]).encode("utf-8"),
+    digest_size=8,
+).hexdigest()
+
+
 def ensure_notetype(col) -> NotetypeDict:  # noqa: ANN001
     """Get or create the Burnki note type."""
     model = col.models.by_name(MODEL_NAME)
@@ -160,15 +170,16 @@ def _create_notetype(col) -> NotetypeDict:  # noqa: ANN001
     col.models.add_template(model, tmpl)
 
     model["css"] = CSS
+    model[TEMPLATE_HASH_KEY] = TEMPLATE_HASH
 
     col.models.add(model)
     return model
 
 
 def _update_if_needed(col, model: NotetypeDict) -> NotetypeDict:  # noqa: ANN001
-    """Add any missing fields and update templates/css if they changed.
-    This way we can add new fields in future versions without breaking
-    existing installs."""
+    """Add any missing fields, and rewrite templates/css when the stored
+    template hash doesn't match this version. This way we can add new
+    fields in future versions without breaking existing installs."""
     existing_names = {f["name"] for f in model["flds"]}
     changed = False
 
@@ -178,16 +189,11 @@ def _update_if_needed(col, model: NotetypeDict) -> NotetypeDict:  # noqa: ANN001
             col.models.add_field(model, field)
             changed = True
 
-    if model["css"] != CSS:
+    if model.get(TEMPLATE_HASH_KEY) != TEMPLATE_HASH:
         model["css"] = CSS
-        changed = True
-
-    if model["tmpls"][0]["qfmt"] != FRONT_TEMPLATE:
         model["tmpls"][0]["qfmt"] = FRONT_TEMPLATE
-        changed = True
-
-    if model["tmpls"][0]["afmt"] != BACK_TEMPLATE:
         model["tmpls"][0]["afmt"] = BACK_TEMPLATE
+        model[TEMPLATE_HASH_KEY] = TEMPLATE_HASH
         changed = True
 
     if changed:
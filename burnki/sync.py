@@ -4,17 +4,25 @@ background thread, then creates/updates Anki notes on the main thread"""
 
 from __future__ import annotations
 
+import os
 import re
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Callable, Optional
 
 from . import wanikani
-from .wanikani import Subject
+from .wanikani import SLOTS, Subject
 
 DECK_NAME = "Burnki"
+AUDIO_WORKERS = 8
+LOOKUP_BATCH_SIZE = 100  # subject ids per find_notes search
+PROGRESS_EVERY = 10  # only report every Nth item, each update hops to the main thread
+_FILENAME_RE = re.compile(r"[^\w]")
 
 
-@dataclass
+@dataclass(**SLOTS)
 class NoteData:
     """Everything needed to create or update a single note"""
 
@@ -27,17 +35,18 @@ class NoteData:
     meaning_note: str
     reading_note: str
     audio_filename: str
-    audio_bytes: Optional[bytes]
+    audio_path: Optional[str]  # downloaded file, waiting to be added to media
     context_sentences: str
     level: str
     srs_stage: str
 
 
-@dataclass
+@dataclass(**SLOTS)
 class SyncResult:
     notes: list[NoteData] = field(default_factory=list)
     error: Optional[str] = None
     total_fetched: int = 0
+    audio_dir: Optional[str] = None  # temp dir holding the downloads
 
 
 # -- formatting helpers --
@@ -46,25 +55,41 @@ def _format_meanings(subject: Subject) -> str:
     return ", ".join(subject.meanings)
 
 
-def _format_readings(subject: Subject) -> str:
-    if subject.object == "radical":
-        return ""
+def _format_kanji_readings(subject: Subject) -> str:
+    buckets: dict[str, list[str]] = {"onyomi": [], "kunyomi": []}
+    for r in subject.readings:
+        kind = r.get("type")
+        value = r.get("reading")
+        if kind in buckets and value:
+            buckets[kind].append(value)
+    parts = []
+    if buckets["onyomi"]:
+        parts.append(f"On: {', '.join(buckets['onyomi'])}")
+    if buckets["kunyomi"]:
+        parts.append(f"Kun: {', '.join(buckets['kunyomi'])}")
+    return " · ".join(parts)
 
-    if subject.object == "kanji":
-        onyomi = [r["reading"] for r in subject.readings if r.get("type") == "onyomi" and r.get("reading")]
-        kunyomi = [r["reading"] for r in subject.readings if r.get("type") == "kunyomi" and r.get("reading")]
-        parts = []
-        if onyomi:
-            parts.append(f"On: {', '.join(onyomi)}")
-        if kunyomi:
-            parts.append(f"Kun: {', '.join(kunyomi)}")
-        return " · ".join(parts)
-
-    # vocab / kana vocab
+
+def _format_vocab_readings(subject: Subject) -> str:
     readings = [r["reading"] for r in subject.readings if r.get("reading")]
     return ", ".join(readings)
 
 
+def _format_no_readings(subject: Subject) -> str:
+    return ""
+
+
+_READING_FORMATTERS: dict[str, Callable[[Subject], str]] = {
+    "radical": _format_no_readings,
+    "kanji": _format_kanji_readings,
+}
+
+
+def _format_readings(subject: Subject) -> str:
+    # vocab / kana vocab are the default
+    return _READING_FORMATTERS.get(subject.object, _format_vocab_readings)(subject)
+
+
 def _format_sentences(subject: Subject) -> str:
     if not subject.context_sentences:
         return ""
@@ -78,17 +103,19 @@ def _format_sentences(subject: Subject) -> str:
 
 def _pick_audio(subject: Subject) -> Optional[str]:
     """Prefer male MP3, fall back to any MP3."""
-    mp3s = [a for a in subject.audio if "mpeg" in a.content_type]
-    male = [a for a in mp3s if a.voice_actor_gender == "male"]
-    if male:
-        return male[0].url
-    if mp3s:
-        return mp3s[0].url
-    return None
+    first_mp3 = None
+    for a in subject.audio:
+        if "mpeg" not in a.content_type:
+            continue
+        if a.voice_actor_gender == "male":
+            return a.url
+        if first_mp3 is None:
+            first_mp3 = a
+    return first_mp3.url if first_mp3 else None
 
 
 def _audio_filename(subject: Subject, reading: str) -> str:
-    safe_reading = re.sub(r"[^\w]", "_", reading) if reading else "audio"
+    safe_reading = _FILENAME_RE.sub("_", reading) if reading else "audio"
     return f"burnki_{subject.id}_{safe_reading}.mp3"
 
 
@@ -101,11 +128,51 @@ def _build_characters(subject: Subject) -> str:
 
 # -- background fetch --
 
+def _download_all_audio(
+    jobs: dict[int, tuple[str, str]],
+    progress: Callable[[str], None],
+) -> dict[int, Optional[str]]:
+    """Download audio for {subject_id: (url, dest_path)} concurrently,
+    straight to disk. Failed downloads map to None, the card still works
+    without it."""
+    audio: dict[int, Optional[str]] = {}
+    total = len(jobs)
+    if not total:
+        return audio
+
+    with ThreadPoolExecutor(max_workers=AUDIO_WORKERS) as ex:
+        futures = {ex.submit(wanikani.download_audio, url, path): sid for sid, (url, path) in jobs.items()}
+        for done, future in enumerate(as_completed(futures), start=1):
+            sid = futures[future]
+            path = jobs[sid][1]
+            try:
+                future.result()
+                audio[sid] = path
+            except Exception:
+                audio[sid] = None
+                if os.path.exists(path):
+                    os.remove(path)
+            if done % PROGRESS_EVERY == 0 or done == total:
+                progress(f"Downloading audio {done}/{total}…")
+
+    return audio
+
+
+def _existing_audio(media_dir: str) -> set[str]:
+    """Burnki audio files already in the media folder, so they don't get
+    downloaded again."""
+    try:
+        return {f for f in os.listdir(media_dir) if f.startswith("burnki_")}
+    except OSError:
+        return set()
+
+
 def fetch_sync_data(
     token: str,
     updated_after: Optional[str] = None,
     progress: Optional[callable] = None,
     download_audio: bool = True,
+    media_dir: Optional[str] = None,
 ) -> SyncResult:
     """Runs in a background thread. Grabs everything from WaniKani and
     builds NoteData objects, but doesn't touch Anki's collection yet"""
@@ -124,34 +191,48 @@ def fetch_sync_data(
         subject_ids = [a.subject_id for a in assignments]
         result.total_fetched = len(subject_ids)
 
-        _progress(f"Fetching {len(subject_ids)} subjects…")
-        subjects = wanikani.fetch_subjects(token, subject_ids)
-
-        _progress("Fetching study materials…")
-        materials = wanikani.fetch_study_materials(token, subject_ids)
+        # subjects and study materials don't depend on each other
+        _progress(f"Fetching {len(subject_ids)} subjects and study materials…")
+        with ThreadPoolExecutor(max_workers=2) as ex:
+            subjects_future = ex.submit(wanikani.fetch_subjects, token, subject_ids)
+            materials_future = ex.submit(wanikani.fetch_study_materials, token, subject_ids)
+            subjects = subjects_future.result()
+            materials = materials_future.result()
 
         total = len(subject_ids)
-        for i, sid in enumerate(subject_ids):
+        have_media = _existing_audio(media_dir) if download_audio and media_dir else set()
+        audio_jobs: dict[int, tuple[str, str]] = {}
+        audio_names: dict[int, str] = {}
+        for sid in subject_ids:
             subject = subjects.get(sid)
             if subject is None:
                 continue
-
-            display = subject.characters or subject.slug
-            _progress(f"Processing {i + 1}/{total}: {display}")
-
-            mat = materials.get(sid)
-
             audio_url = _pick_audio(subject) if download_audio and subject.object in ("vocabulary", "kana_vocabulary") else None
-            audio_bytes = None
-            fname = ""
             if audio_url:
                 primary_reading = subject.readings[0]["reading"] if subject.readings else ""
                 fname = _audio_filename(subject, primary_reading)
-                _progress(f"Downloading audio {i + 1}/{total}: {display}")
-                try:
-                    audio_bytes = wanikani.download_audio(audio_url)
-                except Exception:
-                    audio_bytes = None  # card still works without it
+                audio_names[sid] = fname
+                if fname in have_media:
+                    continue  # already in the collection's media folder
+                if result.audio_dir is None:
+                    result.audio_dir = tempfile.mkdtemp(prefix="burnki_")
+                audio_jobs[sid] = (audio_url, os.path.join(result.audio_dir, fname))
+
+        audio_paths = _download_all_audio(audio_jobs, _progress)
+
+        # size is known up front; unused slots (missing subjects) are trimmed below
+        notes: list[Optional[NoteData]] = [None] * total
+        out_idx = 0
+        for i, sid in enumerate(subject_ids):
+            subject = subjects.get(sid)
+            if subject is None:
+                continue
+
+            if i % PROGRESS_EVERY == 0 or i + 1 == total:
+                display = subject.characters or subject.slug
+                _progress(f"Processing {i + 1}/{total}: {display}")
+
+            mat = materials.get(sid)
 
             note = NoteData(
                 subject_id=subject.id,
@@ -162,20 +243,32 @@ def fetch_sync_data(
                 user_meanings=", ".join(mat.meaning_synonyms) if mat else "",
                 meaning_note=mat.meaning_note or "" if mat else "",
                 reading_note=mat.reading_note or "" if mat else "",
-                audio_filename=fname,
-                audio_bytes=audio_bytes,
+                audio_filename=audio_names.get(sid, ""),
+                audio_path=audio_paths.get(sid),
                 context_sentences=_format_sentences(subject),
                 level=str(subject.level),
                 srs_stage="Burned",
             )
-            result.notes.append(note)
+            notes[out_idx] = note
+            out_idx += 1
+
+        del notes[out_idx:]
+        result.notes = notes
 
     except Exception as e:
         result.error = str(e)
+        cleanup_sync_result(result)
 
     return result
 
 
+def cleanup_sync_result(result: SyncResult) -> None:
+    """Remove any downloaded audio that didn't make it into the collection."""
+    if result.audio_dir is not None:
+        shutil.rmtree(result.audio_dir, ignore_errors=True)
+        result.audio_dir = None
+
+
 # -- main thread: apply to Anki --
 
 def apply_sync_result(col, result: SyncResult) -> tuple[int, int]:  # noqa: ANN001
@@ -194,28 +287,67 @@ def apply_sync_result(col, result: SyncResult) -> tuple[int, int]:  # noqa: ANN0
         model["did"] = deck_id
         col.models.update_dict(model)
 
-    created = 0
-    updated = 0
-
+    # media first, so the note updates below aren't interleaved with disk writes
     for nd in result.notes:
-        if nd.audio_bytes and nd.audio_filename:
-            col.media.write_data(nd.audio_filename, nd.audio_bytes)
+        if nd.audio_path and nd.audio_filename:
+            nd.audio_filename = col.media.add_file(nd.audio_path)
+    cleanup_sync_result(result)
+
+    existing = _existing_note_ids(col, model, [str(nd.subject_id) for nd in result.notes])
+    to_update = []
+    to_add = {}
 
+    for nd in result.notes:
         # check if we already have this subject
-        existing_ids = col.find_notes(f'"SubjectId:{nd.subject_id}"')
+        key = str(nd.subject_id)
+        note_id = existing.get(key)
 
-        if existing_ids:
-            note = col.get_note(existing_ids[0])
+        if note_id is not None:
+            note = col.get_note(note_id)
             _set_note_fields(note, nd)
-            col.update_note(note)
-            updated += 1
+            to_update.append(note)
         else:
-            note = col.new_note(model)
+            note = to_add.get(key) or col.new_note(model)
             _set_note_fields(note, nd)
-            col.add_note(note, deck_id)
-            created += 1
+            to_add[key] = note
+
+    # one backend call (and one undo step) per batch instead of per note
+    if to_update:
+        col.update_notes(to_update)
+    if to_add:
+        _add_notes(col, list(to_add.values()), deck_id)
 
-    return created, updated
+    return len(to_add), len(to_update)
+
+
+def _add_notes(col, notes: list, deck_id: int) -> None:  # noqa: ANN001
+    """Bulk add where the Anki version supports it (2.1.55+)."""
+    try:
+        from anki.collection import AddNoteRequest
+    except ImportError:
+        for note in notes:
+            col.add_note(note, deck_id)
+        return
+    col.add_notes([AddNoteRequest(note=note, deck_id=deck_id) for note in notes])
+
+
+def _existing_note_ids(col, model, subject_ids: list[str]) -> dict[str, int]:  # noqa: ANN001
+    """Map SubjectId -> note id. Burnki notes come from one query instead
+    of a find_notes search per subject; subjects not found there still go
+    through find_notes (batched), since notes can also live under a copy
+    of the note type, e.g. "Burnki-xxxxx" after a deck import"""
+    ord_ = col.models.field_map(model)["SubjectId"][0]
+    ids: dict[str, int] = {}
+    for nid, flds in col.db.all("select id, flds from notes where mid = ?", model["id"]):
+        ids.setdefault(flds.split("\x1f")[ord_], nid)
+
+    missing = [sid for sid in subject_ids if sid not in ids]
+    for i in range(0, len(missing), LOOKUP_BATCH_SIZE):
+        query = " OR ".join(f'"SubjectId:{sid}"' for sid in missing[i : i + LOOKUP_BATCH_SIZE])
+        for nid in col.find_notes(query):
+            ids.setdefault(col.get_note(nid)["SubjectId"], nid)
+
+    return ids
 
 
 def _set_note_fields(note, nd: NoteData) -> None:  # noqa: ANN001
@@ -1,33 +1,73 @@
-"""WaniKani API client. Uses only stdlib (urllib) so we don't need
-any external dependencies. Handles pagination, rate limiting, and
-batching."""
+"""WaniKani API client. Uses requests (bundled with Anki) so all calls
+share one pooled keep-alive session. Handles pagination, rate limiting,
+and batching."""
 
 from __future__ import annotations
 
 import json
+import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Callable, Optional
-from urllib.request import Request, urlopen
+from typing import Any, Callable, Mapping, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson  # bundled with recent Anki versions
+
+    _loads: Callable[[bytes], Any] = orjson.loads
+except ImportError:
+    def _loads(raw: bytes) -> Any:
+        return json.loads(raw.decode("utf-8"))
 
 API_BASE = "https://api.wanikani.com/v2"
+API_REVISION = "20170710"
 BATCH_SIZE = 500  # keep URLs from getting too long
+TIMEOUT = 30
+PAGE_WORKERS = 4  # batches fetched in parallel over the shared session
+
+# slots=True needs Python 3.10, older Anki builds still ship 3.9
+SLOTS: dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+def _new_session() -> requests.Session:
+    """One session for the whole add-on, so every page, batch and audio
+    file reuses the same TLS connection instead of doing a new handshake.
+
+    This is HTTP/1.1 keep-alive rather than HTTP/2 multiplexing: Anki doesn't
+    bundle an HTTP/2 client (httpx + h2), so the concurrent page and audio
+    workers each get their own pooled connection. pool_maxsize is large
+    enough for all of them to run at once without reopening connections."""
+    session = requests.Session()
+    retries = Retry(
+        total=5,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+    )
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retries))
+    return session
+
+
+_SESSION = _new_session()
 
 
-@dataclass
+@dataclass(**SLOTS)
 class Assignment:
     subject_id: int
     srs_stage: int
 
 
-@dataclass
+@dataclass(**SLOTS)
 class AudioEntry:
     url: str
     content_type: str
     voice_actor_gender: str
 
 
-@dataclass
+@dataclass(**SLOTS)
 class Subject:
     id: int
     object: str  # "radical", "kanji", "vocabulary", "kana_vocabulary"
@@ -40,7 +80,7 @@ class Subject:
     context_sentences: list[dict[str, str]]
 
 
-@dataclass
+@dataclass(**SLOTS)
 class StudyMaterial:
     subject_id: int
     meaning_synonyms: list[str]
@@ -48,18 +88,21 @@ class StudyMaterial:
     reading_note: Optional[str]
 
 
-def _make_request(url: str, token: str) -> tuple[dict[str, Any], dict[str, str]]:
-    req = Request(url)
-    req.add_header("Authorization", f"Bearer {token}")
-    req.add_header("Wanikani-Revision", "20170710")
-
-    resp = urlopen(req, timeout=30)
-    headers = {k.lower(): v for k, v in resp.headers.items()}
-    body = json.loads(resp.read().decode("utf-8"))
-    return body, headers
+def _make_request(url: str, token: str) -> tuple[dict[str, Any], Mapping[str, str]]:
+    resp = _SESSION.get(
+        url,
+        headers={
+            "Authorization": f"Bearer {token}",
+            "Wanikani-Revision": API_REVISION,
+        },
+        timeout=TIMEOUT,
+    )
+    resp.raise_for_status()
+    # resp.headers is already case-insensitive
+    return _loads(resp.content), resp.headers
 
 
-def _respect_rate_limit(headers: dict[str, str]) -> None:
+def _respect_rate_limit(headers: Mapping[str, str]) -> None:
     """Back off if we're about to hit the rate limit."""
     remaining = headers.get("ratelimit-remaining")
     reset = headers.get("ratelimit-reset")
@@ -171,16 +214,20 @@ def fetch_subjects(
     """Fetch subjects by ID, returns {subject_id: Subject}."""
     subjects: dict[int, Subject] = {}
 
-    for batch in _batch_ids(subject_ids):
-        ids_param = ",".join(str(i) for i in batch)
-        url = f"{API_BASE}/subjects?ids={ids_param}"
+    def collect(body: dict[str, Any]) -> None:
+        for item in body.get("data", []):
+            s = _parse_subject(item)
+            subjects[s.id] = s
 
-        def collect(body: dict[str, Any]) -> None:
-            for item in body.get("data", []):
-                s = _parse_subject(item)
-                subjects[s.id] = s
+    with ThreadPoolExecutor(max_workers=PAGE_WORKERS) as ex:
+        futures = []
+        for batch in _batch_ids(subject_ids):
+            ids_param = ",".join(str(i) for i in batch)
+            url = f"{API_BASE}/subjects?ids={ids_param}"
+            futures.append(ex.submit(_paginate, url, token, collect, progress))
 
-        _paginate(url, token, collect, progress)
+        for future in futures:
+            future.result()
 
     return subjects
 
@@ -193,21 +240,28 @@ def fetch_study_materials(
     """Fetch user's study materials (synonyms, notes) for the given subjects."""
     materials: dict[int, StudyMaterial] = {}
 
-    for batch in _batch_ids(subject_ids):
-        ids_param = ",".join(str(i) for i in batch)
-        url = f"{API_BASE}/study_materials?subject_ids={ids_param}"
+    def collect(body: dict[str, Any]) -> None:
+        for item in body.get("data", []):
+            m = _parse_study_material(item)
+            materials[m.subject_id] = m
 
-        def collect(body: dict[str, Any]) -> None:
-            for item in body.get("data", []):
-                m = _parse_study_material(item)
-                materials[m.subject_id] = m
+    with ThreadPoolExecutor(max_workers=PAGE_WORKERS) as ex:
+        futures = []
+        for batch in _batch_ids(subject_ids):
+            ids_param = ",".join(str(i) for i in batch)
+            url = f"{API_BASE}/study_materials?subject_ids={ids_param}"
+            futures.append(ex.submit(_paginate, url, token, collect, progress))
 
-        _paginate(url, token, collect, progress)
+        for future in futures:
+            future.result()
 
     return materials
 
 
-def download_audio(url: str) -> bytes:
-    req = Request(url)
-    resp = urlopen(req, timeout=30)
-    return resp.read()
+def download_audio(url: str, dest: str) -> None:
+    """Stream an audio file to dest without holding it all in memory."""
+    with _SESSION.get(url, timeout=TIMEOUT, stream=True) as resp:
+        resp.raise_for_status()
+        with open(dest, "wb") as f:
+            for chunk in resp.iter_content(chunk_size=64 * 1024):
+                f.write(chunk)